@@ -1,5 +1,5 @@
 from WineQuality.constants import *
-from WineQuality.utils.common import read_yaml, create_directories
+from WineQuality.utils.common import read_yamls, create_directories
 from WineQuality.entity.config_entity import DataIngestionConfig,DataValidationConfig,DataTransformationConfig,ModelTrainerConfig ,ModelEvaluationConfig
 
 class ConfigurationManager:
@@ -9,9 +9,10 @@ class ConfigurationManager:
         params_filepath = PARAMS_FILE_PATH,
         schema_filepath = SCHEMA_FILE_PATH):
 
-        self.config = read_yaml(config_filepath)
-        self.params = read_yaml(params_filepath)
-        self.schema = read_yaml(schema_filepath)
+        configs = read_yamls([config_filepath, params_filepath, schema_filepath])
+        self.config = configs[config_filepath]
+        self.params = configs[params_filepath]
+        self.schema = configs[schema_filepath]
 
         create_directories([self.config.artifacts_root])
 
@@ -1,119 +1,399 @@
+from __future__ import annotations  # Keep annotations lazy so ConfigBox needn't be imported
+
 import os  # Module to interact with the operating system
-from box.exceptions import BoxValueError  # Exception class for Box-related errors
-import yaml  # Module for working with YAML files
+import functools  # Caching helpers for parsed config files
+import contextlib  # Context manager helpers
+import hashlib  # Content digests for the YAML cache
+import importlib  # Resolves the lazily imported modules below
+import mmap  # Memory-mapped reads for large files
 from WineQuality import logger  # Custom logger for the project
-import json  # Module for working with JSON files
-import joblib  # Module for saving/loading binary files
-from ensure import ensure_annotations  # Decorator for enforcing function annotations
-from box import ConfigBox  # Enhanced dictionary-like object from Box
+import orjson  # Fast JSON encoder/decoder
+import pickle  # Module for serializing Python objects
+import threading  # Guards updates to the shared YAML caches
 from pathlib import Path  # Module for working with file system paths
-from typing import Any  # Generic type hint for any type
+from typing import Any, Iterator  # Generic type hints
+
+# yaml, box and zstandard are imported on first use; these names are exposed
+# lazily through the module-level __getattr__ below
+_LAZY_ATTRS = {
+    "yaml": ("yaml", None),
+    "zstd": ("zstandard", None),
+    "ijson": ("ijson", None),
+    "ConfigBox": ("box", "ConfigBox"),
+    "BoxValueError": ("box.exceptions", "BoxValueError"),
+}
+
+
+def __getattr__(name):
+    """Imports the optional heavy modules listed in _LAZY_ATTRS on first access (PEP 562)."""
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _LAZY_ATTRS[name]
+    module = importlib.import_module(module_name)
+    return module if attr is None else getattr(module, attr)
+
+
+# Runtime type checking is opt-in (dev/test only) so production calls pay nothing
+if os.environ.get("WINEQUALITY_TYPECHECK"):
+    from beartype import beartype as _typecheck
+    from box import ConfigBox  # Needed to resolve the lazy return annotations
+else:
+    def _typecheck(func):
+        return func
 
+# Files larger than this are parsed from a read-only mmap instead of a read() copy
+_MMAP_THRESHOLD = 64 * 1024
 
-# In-memory cache for YAML files
+# Below this combined size, read_yamls parses in-process since pool start-up would dominate
+_PARALLEL_YAML_THRESHOLD = 1024 * 1024
+
+# Parsed YAML keyed by `_file_key` key, and by SHA-256 of the raw bytes so identical
+# files parse once; both are bounded to _YAML_CACHE_SIZE entries
 _yaml_cache = {}
+_yaml_content_cache = {}
+_YAML_CACHE_SIZE = 64
+_yaml_cache_lock = threading.Lock()
 
+# (divisor, format) per size bucket used by get_size
+_SIZE_UNITS = [
+    (1, "{:.0f} bytes"),
+    (1024, "~ {:.2f} KB"),
+    (1024 ** 2, "~ {:.2f} MB"),
+    (1024 ** 3, "~ {:.2f} GB"),
+]
 
-@ensure_annotations
-def read_yaml(path_to_yaml: Path) -> ConfigBox:
-    """Reads a YAML file and returns its content as a ConfigBox object.
+
+def _file_key(path) -> tuple:
+    """Builds a cache key that changes whenever the file on disk changes.
+
+    The path is resolved with os.path.realpath so relative, absolute and
+    symlinked spellings of the same file share one key.
 
     Args:
-        path_to_yaml (Path): Path to the YAML file.
+        path: Path to the file.
 
-    Raises:
-        ValueError: If the YAML file is empty.
-        e: If any other error occurs during file reading.
+    Returns:
+        tuple: (real path, mtime in nanoseconds, size in bytes).
+    """
+    real = os.path.realpath(path)
+    st = os.stat(real)
+    return (real, st.st_mtime_ns, st.st_size)
+
+
+@contextlib.contextmanager
+def _read_source(key: tuple):
+    """Yields the bytes of the file identified by a `_file_key` key.
+
+    Files above _MMAP_THRESHOLD are exposed as a read-only mmap instead of a read() copy.
+    """
+    with open(key[0], "rb") as f:
+        if key[2] > _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield mm
+        else:
+            yield f.read()
+
+
+def _parse_yaml_source(source) -> Any:
+    """Parses YAML from bytes or an mmap into plain Python objects."""
+    import yaml
+
+    # Prefer the libyaml-backed loader; fall back to the pure-Python one if unavailable
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(source, Loader=loader)  # Parse YAML content
+
+
+def _parse_yaml_file(key: tuple) -> tuple:
+    """Hashes and parses the YAML file identified by a `_file_key` key.
+
+    Runs in the read_yamls pool workers, so it returns plain Python objects.
 
     Returns:
-        ConfigBox: A ConfigBox object containing the parsed YAML data.
+        tuple: (SHA-256 digest of the raw bytes, parsed content).
+    """
+    with _read_source(key) as source:
+        return hashlib.sha256(source).digest(), _parse_yaml_source(source)
+
+
+def _store(cache: dict, cache_key, value):
+    """Inserts into one of the bounded YAML caches, evicting the oldest entry when full.
+
+    Callers must hold _yaml_cache_lock.
     """
-    global _yaml_cache
-    if path_to_yaml in _yaml_cache:
-        logger.info(f"yaml file: {path_to_yaml} retrieved from cache")
-        return _yaml_cache[path_to_yaml]
+    if cache_key not in cache and len(cache) >= _YAML_CACHE_SIZE:
+        cache.pop(next(iter(cache)), None)  # Evict the oldest entry
+    cache[cache_key] = value
+
+
+def _load_yaml(key: tuple, parsed=None) -> ConfigBox:
+    """Returns the ConfigBox for a `_file_key` key, parsing the file on a cache miss.
 
+    Files with identical content share a single parsed ConfigBox.
+
+    Args:
+        key (tuple): Key built by `_file_key`.
+        parsed (Future, optional): Pending `_parse_yaml_file` result from read_yamls'
+            pool, used instead of reading the file again.
+    """
+    from box import ConfigBox
+
+    config = _yaml_cache.get(key)
+    if config is not None:
+        return config
+    if parsed is not None:
+        digest, content = parsed.result()
+        config = _yaml_content_cache.get(digest)
+        if config is None:
+            config = ConfigBox(content, frozen_box=True)  # Convert content to a read-only ConfigBox
+    else:
+        with _read_source(key) as source:
+            digest = hashlib.sha256(source).digest()
+            config = _yaml_content_cache.get(digest)
+            if config is None:
+                # Convert content to a read-only ConfigBox
+                config = ConfigBox(_parse_yaml_source(source), frozen_box=True)
+    with _yaml_cache_lock:
+        _store(_yaml_content_cache, digest, config)
+        _store(_yaml_cache, key, config)
+    return config
+
+
+def _yaml_file_key(path_to_yaml) -> tuple:
+    """Builds the `_file_key` key for a YAML file, logging failures like read_yaml does."""
     try:
-        # Open and load the YAML file safely
-        with open(path_to_yaml) as yaml_file:
-            content = yaml.safe_load(yaml_file)  # Parse YAML content
-            logger.info(f"yaml file: {path_to_yaml} loaded successfully")  # Log success
-            config = ConfigBox(content)  # Convert content to ConfigBox
-            _yaml_cache[path_to_yaml] = config  # Cache the loaded content
-            return config
+        return _file_key(path_to_yaml)
+    except Exception as e:
+        # Log unexpected exceptions (missing or unreadable file) for debugging
+        logger.error("Error reading YAML file at %s: %s", path_to_yaml, e)
+        raise e
+
+
+def _read_yaml_key(path_to_yaml, key: tuple, parsed=None) -> ConfigBox:
+    """Loads a YAML file through the caches with read_yaml's logging and error handling."""
+    from box.exceptions import BoxValueError
+
+    try:
+        config = _load_yaml(key, parsed)
+        logger.info("yaml file: %s loaded successfully", path_to_yaml)  # Log success
+        return config
     except BoxValueError:
         # Raise an error if the YAML file is empty
         raise ValueError("yaml file is empty")
     except Exception as e:
         # Log unexpected exceptions for debugging
-        logger.error(f"Error reading YAML file at {path_to_yaml}: {e}")
+        logger.error("Error reading YAML file at %s: %s", path_to_yaml, e)
         raise e
 
 
-@ensure_annotations
+@_typecheck
+def read_yaml(path_to_yaml: Path) -> ConfigBox:
+    """Reads a YAML file and returns its content as a ConfigBox object.
+
+    Results are cached per (real path, mtime, size), so edits to the file on
+    disk are picked up on the next call, and files with identical content are
+    parsed only once.
+
+    Args:
+        path_to_yaml (Path): Path to the YAML file.
+
+    Raises:
+        ValueError: If the YAML file is empty.
+        e: If any other error occurs during file reading.
+
+    Returns:
+        ConfigBox: A frozen ConfigBox containing the parsed YAML data. Lists come
+            back as tuples. It is shared between callers, so call `.to_dict()`
+            first if you need to modify it.
+    """
+    return _read_yaml_key(path_to_yaml, _yaml_file_key(path_to_yaml))
+
+
+@_typecheck
+def read_yamls(paths: list) -> dict:
+    """Reads several YAML files and returns their contents keyed by path.
+
+    Files missing from the cache are parsed in parallel in a process pool when
+    they are large enough to be worth it. Either way the results go through the
+    same caches, logging and error handling as `read_yaml`.
+
+    Args:
+        paths (list): Paths to the YAML files.
+
+    Raises:
+        ValueError: If any of the YAML files is empty.
+
+    Returns:
+        dict: Mapping of each path to a frozen ConfigBox with its parsed YAML data
+            (lists come back as tuples, as in `read_yaml`).
+    """
+    keys = [_yaml_file_key(path) for path in paths]
+    pending = list(dict.fromkeys(key for key in keys if key not in _yaml_cache))
+    if len(pending) < 2 or sum(key[2] for key in pending) < _PARALLEL_YAML_THRESHOLD:
+        return {path: _read_yaml_key(path, key) for path, key in zip(paths, keys)}
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Workers return plain dicts; the ConfigBox wrap happens here to keep pickling cheap
+    with ProcessPoolExecutor(max_workers=min(len(pending), os.cpu_count() or 1)) as executor:
+        futures = {key: executor.submit(_parse_yaml_file, key) for key in pending}
+    return {path: _read_yaml_key(path, key, futures.get(key)) for path, key in zip(paths, keys)}
+
+
+@_typecheck
 def create_directories(path_to_directories: list, verbose=True):
     """Creates a list of directories if they do not exist.
 
+    Duplicate paths and paths that are ancestors of another requested path are
+    dropped first. Remaining paths are grouped by parent, and each existing
+    parent is listed once with os.scandir instead of stat-ing every child.
+
     Args:
         path_to_directories (list): List of paths to directories to be created.
-        verbose (bool, optional): If True, logs the creation of each directory. Defaults to True.
+        verbose (bool, optional): If True, logs the created directories. Defaults to True.
     """
-    for path in path_to_directories:
-        if not os.path.exists(path):  # Only attempt creation if directory doesn't exist
-            os.makedirs(path, exist_ok=True)
-            if verbose:
-                logger.info(f"Created directory at: {path}")
-        elif verbose:
-            logger.info(f"Directory already exists at: {path}")
+    unique = sorted({os.path.normpath(p) for p in path_to_directories}, key=len, reverse=True)
+    leaves = []
+    for path in unique:
+        # Deeper paths come first; skip any path already covered by one of them
+        if not any(leaf.startswith(path + os.sep) for leaf in leaves):
+            leaves.append(path)
+    by_parent = {}
+    for path in leaves:
+        parent, name = os.path.split(path)
+        by_parent.setdefault(parent or os.curdir, []).append((path, name))
 
+    created, existing = [], []
+    for parent, children in by_parent.items():
+        try:
+            with os.scandir(parent) as entries:
+                listing = {entry.name for entry in entries}
+        except FileNotFoundError:
+            # Parent is missing too, so the whole chain has to be created
+            for path, _ in children:
+                os.makedirs(path, exist_ok=True)
+                created.append(path)
+            continue
+        except OSError:
+            # Parent can't be listed (e.g. mode 711), so probe each child instead
+            for path, _ in children:
+                (existing if os.path.isdir(path) else created).append(path)
+                os.makedirs(path, exist_ok=True)
+            continue
+        for path, name in children:
+            if name in listing:
+                existing.append(path)
+                continue
+            try:
+                os.mkdir(path)
+                created.append(path)
+            except FileExistsError:
+                existing.append(path)
+    if verbose:
+        logger.info("Created directories: %s; already existing: %s", created, existing)
 
-@ensure_annotations
+
+@_typecheck
 def save_json(path: Path, data: dict):
     """Saves a dictionary as a JSON file.
 
+    Non-string keys are converted to strings. Non-finite floats (NaN, Infinity)
+    are written as `null`, so they load back as None rather than NaN.
+
     Args:
         path (Path): Path where the JSON file will be saved.
         data (dict): Data to be saved as JSON.
     """
-    # Open the file in write mode and save data as JSON
-    with open(path, "w") as f:
-        json.dump(data, f, indent=4)  # Save JSON with indentation for readability
-    logger.info(f"JSON file saved at: {path}")  # Log the save operation
+    # Encode straight to bytes; OPT_SERIALIZE_NUMPY handles numpy metric values
+    payload = orjson.dumps(
+        data,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+    )
+    with open(path, "wb") as f:
+        f.write(payload)
+    logger.info("JSON file saved at: %s", path)  # Log the save operation
+
 
+@functools.lru_cache(maxsize=64)
+def _load_json(key: tuple) -> ConfigBox:
+    """Parses the JSON file identified by a `_file_key` key (cached)."""
+    from box import ConfigBox
 
-@ensure_annotations
+    with open(key[0], "rb") as f:
+        if key[2] > _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                content = orjson.loads(view)  # Load JSON content
+        else:
+            content = orjson.loads(f.read())  # Load JSON content
+    return ConfigBox(content, frozen_box=True)  # Return content as a read-only ConfigBox
+
+
+@_typecheck
 def load_json(path: Path) -> ConfigBox:
     """Loads a JSON file and returns its content as a ConfigBox object.
 
+    Results are cached per (real path, mtime, size), so edits to the file on disk
+    are picked up on the next call.
+
     Args:
         path (Path): Path to the JSON file.
 
     Returns:
-        ConfigBox: A ConfigBox object containing the parsed JSON data.
+        ConfigBox: A frozen ConfigBox containing the parsed JSON data. Lists come
+            back as tuples. It is shared between callers, so call `.to_dict()`
+            first if you need to modify it.
     """
-    # Open and read the JSON file
-    with open(path) as f:
-        content = json.load(f)  # Load JSON content
-    logger.info(f"JSON file loaded successfully from: {path}")  # Log success
-    return ConfigBox(content)  # Return content as a ConfigBox object
+    content = _load_json(_file_key(path))
+    logger.info("JSON file loaded successfully from: %s", path)  # Log success
+    return content
 
 
-@ensure_annotations
+@functools.lru_cache(maxsize=1)
+def _ijson_backend():
+    """Returns the fastest available ijson backend, preferring the yajl2 C extension."""
+    import ijson
+
+    try:
+        return ijson.get_backend("yajl2_c")
+    except ImportError:
+        return ijson
+
+
+@_typecheck
+def load_json_stream(path: Path, prefix: str = "item") -> Iterator[Any]:
+    """Streams the items under `prefix` from a JSON file without loading the whole document.
+
+    Args:
+        path (Path): Path to the JSON file.
+        prefix (str, optional): ijson prefix selecting the items to yield. Defaults to "item",
+            i.e. the elements of a top-level array.
+
+    Yields:
+        Any: Each parsed item matching the prefix.
+    """
+    with open(path, "rb") as f:
+        yield from _ijson_backend().items(f, prefix, use_float=True)
+    logger.info("JSON file streamed from: %s", path)
+
+
+@_typecheck
 def save_bin(data: Any, path: Path):
-    """Saves data as a binary file using joblib.
+    """Saves data as a zstd-compressed pickle (protocol 5).
 
     Args:
         data (Any): Data to be saved as a binary file.
         path (Path): Path where the binary file will be saved.
     """
-    # Save data to the binary file using joblib
-    joblib.dump(value=data, filename=path)
-    logger.info(f"Binary file saved at: {path}")  # Log the save operation
+    import zstandard as zstd
+
+    # Stream the pickle through a zstd compressor straight to disk
+    with open(path, "wb") as f, zstd.ZstdCompressor(level=3, threads=-1).stream_writer(f) as w:
+        pickle.dump(data, w, protocol=5)
+    logger.info("Binary file saved at: %s", path)  # Log the save operation
 
 
-@ensure_annotations
+@_typecheck
 def load_bin(path: Path) -> Any:
-    """Loads data from a binary file.
+    """Loads data from a binary file written by `save_bin`.
 
     Args:
         path (Path): Path to the binary file.
@@ -121,13 +401,16 @@ def load_bin(path: Path) -> Any:
     Returns:
         Any: Data retrieved from the binary file.
     """
-    # Load data from the binary file using joblib
-    data = joblib.load(path)
-    logger.info(f"Binary file loaded from: {path}")  # Log success
+    import zstandard as zstd
+
+    # Decompress and unpickle the binary file in a single stream
+    with open(path, "rb") as f, zstd.ZstdDecompressor().stream_reader(f) as r:
+        data = pickle.load(r)
+    logger.info("Binary file loaded from: %s", path)  # Log success
     return data  # Return the loaded data
 
 
-@ensure_annotations
+@_typecheck
 def get_size(path: Path) -> str:
     """Gets the size of a file in an appropriate unit.
 
@@ -135,12 +418,10 @@ def get_size(path: Path) -> str:
         path (Path): Path to the file.
 
     Returns:
-        str: File size in an appropriate unit (bytes, KB, or MB).
+        str: File size in an appropriate unit (bytes, KB, MB, or GB).
     """
     size_in_bytes = os.path.getsize(path)
-    if size_in_bytes < 1024:
-        return f"{size_in_bytes} bytes"
-    elif size_in_bytes < 1024 ** 2:
-        return f"~ {size_in_bytes / 1024:.2f} KB"
-    else:
-        return f"~ {size_in_bytes / (1024 ** 2):.2f} MB"
+    # Each unit spans 10 bits, so bit_length() picks the bucket without an elif ladder
+    idx = min((size_in_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1) if size_in_bytes else 0
+    divisor, fmt = _SIZE_UNITS[idx]
+    return fmt.format(size_in_bytes / divisor)
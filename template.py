@@ -35,24 +35,30 @@ list_of_files = [
     "test.py"  # Script for testing
 ]
 
-# Iterating through each file path in the list
-for filepath in list_of_files:
-    # Converting the string path to a Path object for compatibility and easy handling
-    filepath = Path(filepath)
-    # Splitting the path into directory and file name
-    filedir, filename = os.path.split(filepath)
-
-    # If the directory path is not empty, create the directory (if it doesn't already exist)
-    if filedir != "":
-        os.makedirs(filedir, exist_ok=True)  # Create directories as needed
-        logging.info(f"Creating directory; {filedir} for the file: {filename}")
+# Converting the non-empty entries to Path objects for easy handling
+paths = [Path(p) for p in list_of_files if p]
 
+# Collecting the unique parent directories and creating each one once, shallowest first
+dirs = sorted({p.parent for p in paths if p.parent != Path("")}, key=lambda d: len(d.parts))
+for filedir in dirs:
+    os.makedirs(filedir, exist_ok=True)  # Create directories as needed
+    logging.info(f"Creating directory; {filedir}")
+
+
+def _needs_create(filepath):
+    """Returns True if the file is missing or empty, using a single stat call."""
+    try:
+        return os.stat(filepath).st_size == 0
+    except FileNotFoundError:
+        return True
+
+
+for filepath in paths:
     # If the file doesn't exist or is empty, create it
-    if (not os.path.exists(filepath)) or (os.path.getsize(filepath) == 0):
-        with open(filepath, "w") as f:  # Open the file in write mode
-            pass  # Create an empty file
+    if _needs_create(filepath):
+        filepath.touch()  # Create an empty file
         logging.info(f"Creating empty file: {filepath}")
 
     else:
         # Log that the file already exists
-        logging.info(f"{filename} already exists")
+        logging.info(f"{filepath.name} already exists")